@@ -16,7 +16,7 @@ class ForecastMetadata(BaseModel):
 
 class ForecastData(BaseModel):
     text: str = Field(..., description="Forecast text content")
-    audio_base64: str = Field(..., description="Base64-encoded audio WAV data")
+    audio_base64: Optional[str] = Field(None, description="Base64-encoded audio WAV data (omitted when include_audio=false)")
     picture_url: Optional[str] = Field(None, description="Public URL for forecast picture")
     forecast_at: str = Field(..., description="When forecast was made (ISO 8601)")
     expires_at: str = Field(..., description="When forecast expires (ISO 8601)")
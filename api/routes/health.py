@@ -3,6 +3,7 @@ Health check endpoint.
 """
 from fastapi import APIRouter
 from datetime import datetime
+import asyncio
 
 from api.models.responses import HealthResponse
 from core.database import test_db_connection
@@ -11,23 +12,11 @@ from config import settings
 router = APIRouter()
 
 
-@router.get(
-    "/",
-    response_model=HealthResponse,
-    responses={
-        200: {"description": "Service is healthy"},
-        503: {"description": "Service is unhealthy"}
-    },
-    summary="Health check",
-    description="Verifies API and database connectivity status"
-)
-async def health_check():
-    """Health check endpoint"""
-    db_status = test_db_connection()
-
+def _health_response(db_status: dict) -> dict:
+    """Build the health response from a database status dictionary"""
     is_healthy = db_status.get("connected", False)
 
-    response = {
+    return {
         "status": "healthy" if is_healthy else "unhealthy",
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "database": {
@@ -41,4 +30,33 @@ async def health_check():
         "api_version": settings.API_VERSION
     }
 
-    return response
+
+@router.get(
+    "/",
+    response_model=HealthResponse,
+    responses={
+        200: {"description": "Service is healthy"},
+        503: {"description": "Service is unhealthy"}
+    },
+    summary="Health check",
+    description="Verifies API and database connectivity status using the connection pool's ping"
+)
+async def health_check():
+    """Health check endpoint"""
+    # Run the blocking connection check off the event loop
+    return _health_response(await asyncio.to_thread(test_db_connection))
+
+
+@router.get(
+    "/deep",
+    response_model=HealthResponse,
+    responses={
+        200: {"description": "Service is healthy"},
+        503: {"description": "Service is unhealthy"}
+    },
+    summary="Deep health check",
+    description="Verifies database connectivity and re-checks the server version and forecasts table"
+)
+async def deep_health_check():
+    """Deep health check endpoint"""
+    return _health_response(await asyncio.to_thread(test_db_connection, deep=True))
@@ -1,10 +1,12 @@
 """
 Weather forecast endpoints.
 """
-from fastapi import APIRouter, Query, Path
+from fastapi import APIRouter, Query, Path, BackgroundTasks, Request, Response
+from fastapi.responses import JSONResponse
 from typing import Optional
 import asyncio
-import httpx
+import time
+import weakref
 
 from api.models.responses import (
     WeatherResponse,
@@ -13,24 +15,50 @@ from api.models.responses import (
     ErrorResponse
 )
 from core.database import get_cached_forecast, list_forecasts
+from core.agent_client import get_agent_client
+from core.cache import (
+    forecast_cache_key,
+    cache_expire_seconds,
+    get_cached_response,
+    set_cached_response
+)
 from core.exceptions import ForecastNotFoundError, DatabaseConnectionError
 from datetime import datetime
 from config import settings
 
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-def trigger_forecast_preparation(city: str, language: Optional[str] = None):
+# In-flight forecast triggers keyed on (city, language), with start time.
+# Only the first 404 for a key triggers the Weather Agent.
+INFLIGHT_WINDOW_SECONDS = 60
+_inflight: dict[tuple[str, str], float] = {}
+
+# asyncio primitives bind to the first event loop that waits on them, so
+# they are created per running loop instead of at import time
+_inflight_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+# Cap on concurrent agent calls. Triggers that cannot get a slot within
+# AGENT_SLOT_TIMEOUT_SECONDS are skipped rather than queued.
+AGENT_SLOT_TIMEOUT_SECONDS = 0.1
+_agent_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# Weather Agent request constants, shared by every trigger
+AGENT_APP_NAME = "weather_agent"
+AGENT_USER_ID = "forecast_api"
+_SESSION_HEADERS = {"Content-Type": "application/json"}
+_MESSAGE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "text/event-stream"
+}
+
+
+async def _trigger_http_agent(city: str, language: Optional[str] = None):
     """
-    Trigger async forecast preparation using Weather Agent API.
+    Request forecast preparation from the Weather Agent HTTP API.
 
     Args:
         city: City name to prepare forecast for
@@ -40,73 +68,169 @@ def trigger_forecast_preparation(city: str, language: Optional[str] = None):
         logger.warning("WEATHER_AGENT_URL not configured, skipping forecast preparation")
         return
 
+    # Generate unique session ID with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    session_id = f"forecast_api_{city}_{language or 'en-US'}_{timestamp}"
+
+    # Create prompt for forecast generation
+    language_spec = f" in {language}" if language else ""
+    prompt = f"What is the current weather condition in {city}{language_spec}"
+
+    # Both steps go through the shared client so they reuse one connection.
+    # They must stay sequential: run_sse requires the session to exist.
+    client = get_agent_client()
+
+    # Step 1: Create a session
+    session_url = f"{settings.WEATHER_AGENT_URL}/apps/{AGENT_APP_NAME}/users/{AGENT_USER_ID}/sessions/{session_id}"
+    session_response = await client.post(
+        session_url,
+        headers=_SESSION_HEADERS,
+        json={}
+    )
+    session_response.raise_for_status()
+    logger.info(f"Created session {session_id} for {city}")
+
+    # Step 2: Send a message
+    message_url = f"{settings.WEATHER_AGENT_URL}/run_sse"
+    message_payload = {
+        "appName": AGENT_APP_NAME,
+        "userId": AGENT_USER_ID,
+        "sessionId": session_id,
+        "newMessage": {
+            "role": "user",
+            "parts": [{"text": prompt}]
+        },
+        "streaming": False
+    }
+
+    message_response = await client.post(
+        message_url,
+        headers=_MESSAGE_HEADERS,
+        json=message_payload
+    )
+    message_response.raise_for_status()
+    logger.info(f"Sent forecast request for {city}")
+
+
+def _get_inflight_lock() -> asyncio.Lock:
+    """Get the in-flight registry lock for the running event loop"""
+    loop = asyncio.get_running_loop()
+    lock = _inflight_locks.get(loop)
+    if lock is None:
+        lock = _inflight_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _get_agent_semaphore() -> asyncio.Semaphore:
+    """Get the agent call semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _agent_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _agent_semaphores[loop] = asyncio.Semaphore(settings.MAX_CONCURRENT_AGENT_CALLS)
+    return semaphore
+
+
+async def _acquire_agent_slot(semaphore: asyncio.Semaphore) -> bool:
+    """Try to acquire an agent call slot, returning False if none frees up in time"""
     try:
-        # Create session and send message synchronously (fire and forget)
-        import threading
-
-        def make_api_calls():
-            try:
-                # Generate unique session ID with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                session_id = f"forecast_api_{city}_{language or 'en-US'}_{timestamp}"
-                user_id = "forecast_api"
-
-                # Create prompt for forecast generation
-                language_spec = f" in {language}" if language else ""
-                prompt = f"What is the current weather condition in {city}{language_spec}"
-
-                with httpx.Client(timeout=30.0) as client:
-                    # Step 1: Create a session
-                    session_url = f"{settings.WEATHER_AGENT_URL}/apps/weather_agent/users/{user_id}/sessions/{session_id}"
-                    session_response = client.post(
-                        session_url,
-                        headers={"Content-Type": "application/json"},
-                        json={}
-                    )
-                    session_response.raise_for_status()
-                    logger.info(f"Created session {session_id} for {city}")
-
-                    # Step 2: Send a message
-                    message_url = f"{settings.WEATHER_AGENT_URL}/run_sse"
-                    message_payload = {
-                        "appName": "weather_agent",
-                        "userId": user_id,
-                        "sessionId": session_id,
-                        "newMessage": {
-                            "role": "user",
-                            "parts": [{"text": prompt}]
-                        },
-                        "streaming": False
-                    }
-
-                    message_response = client.post(
-                        message_url,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Accept": "text/event-stream"
-                        },
-                        json=message_payload
-                    )
-                    message_response.raise_for_status()
-                    logger.info(f"Sent forecast request for {city}")
-
-            except Exception as e:
-                logger.warning(f"Failed to trigger forecast for {city}: {str(e)}")
-
-        # Run in background thread (fire and forget)
-        thread = threading.Thread(target=make_api_calls, daemon=True)
-        thread.start()
+        await asyncio.wait_for(semaphore.acquire(), timeout=AGENT_SLOT_TIMEOUT_SECONDS)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+# Forecast trigger strategies, selected by settings.FORECAST_TRIGGER_BACKEND
+_TRIGGER_BACKENDS = {
+    "http_agent": _trigger_http_agent
+}
+
 
+async def trigger_forecast_preparation(city: str, language: Optional[str] = None):
+    """
+    Trigger forecast preparation using the configured trigger backend.
+
+    Runs as a background task after the 404 response has been sent.
+
+    Args:
+        city: City name to prepare forecast for
+        language: Optional language code for the forecast
+    """
+    backend = _TRIGGER_BACKENDS.get(settings.FORECAST_TRIGGER_BACKEND)
+    if backend is None:
+        logger.info(f"Forecast trigger backend is '{settings.FORECAST_TRIGGER_BACKEND}', skipping forecast preparation")
+        return
+
+    key = (city.lower(), language or "")
+    async with _get_inflight_lock():
+        if time.monotonic() - _inflight.get(key, 0) < INFLIGHT_WINDOW_SECONDS:
+            logger.info(f"Forecast preparation already in progress for {city}, skipping")
+            return
+        _inflight[key] = time.monotonic()
+
+    semaphore = _get_agent_semaphore()
+    try:
+        if not await _acquire_agent_slot(semaphore):
+            logger.warning(f"Too many forecast preparations in progress, skipping {city}")
+            return
+
+        try:
+            await backend(city, language)
+        finally:
+            semaphore.release()
     except Exception as e:
-        # Log error but don't fail the request
-        logger.warning(f"Failed to start forecast preparation for {city}: {str(e)}")
+        # Log error but don't fail the request; the traceback is only
+        # formatted if a handler actually emits the warning
+        logger.warning(f"Failed to trigger forecast for {city}: {str(e)}", exc_info=True)
+    finally:
+        _inflight.pop(key, None)
+
+
+def _conditional_response(
+    request: Request,
+    response: Response,
+    forecast_at: str,
+    expires_at: str
+) -> Optional[Response]:
+    """
+    Apply ETag / Cache-Control validators for a forecast.
+
+    The ETag is derived from forecast_at, so it changes whenever a newer
+    forecast is served, and clients may cache until the forecast expires.
+
+    Returns:
+        A 304 Not Modified response if the client's If-None-Match matches,
+        otherwise None after setting the validator headers on `response`
+    """
+    opaque_tag = f'"{int(datetime.fromisoformat(forecast_at).timestamp())}"'
+    etag = f"W/{opaque_tag}"
+    expires = datetime.fromisoformat(expires_at)
+    max_age = max(0, int((expires - datetime.now(expires.tzinfo)).total_seconds()))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}"
+    }
+
+    # If-None-Match uses weak comparison (RFC 9110 8.8.3.2), so W/ is ignored
+    # on both sides. '*' matches any current representation; callers only
+    # get here when a forecast exists
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or opaque_tag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
 
 
 @router.get(
     "/{city}",
     response_model=WeatherResponse,
+    response_model_exclude_unset=True,
     responses={
         200: {"description": "Successful response with forecast data"},
+        304: {"description": "Forecast unchanged since the ETag in If-None-Match"},
         404: {"model": WeatherNotFoundResponse, "description": "Forecast not found"},
         503: {"model": ErrorResponse, "description": "Database connection error"}
     },
@@ -114,12 +238,35 @@ def trigger_forecast_preparation(city: str, language: Optional[str] = None):
     description="Retrieves the most recent valid (non-expired) forecast for the specified city"
 )
 async def get_latest_forecast(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     city: str = Path(..., description="City name (case-insensitive)"),
-    language: Optional[str] = Query(None, description="ISO 639-1 language code filter")
+    language: Optional[str] = Query(None, description="ISO 639-1 language code filter"),
+    include_audio: bool = Query(True, description="Include base64-encoded audio in the response")
 ):
     """Get the latest forecast for a city"""
+    city_lc = city.lower()
+    cache_key = forecast_cache_key(city_lc, language, include_audio)
+
+    cached_response = await get_cached_response(cache_key)
+    if cached_response is not None:
+        forecast = cached_response["forecast"]
+        not_modified = _conditional_response(
+            request, response, forecast["forecast_at"], forecast["expires_at"]
+        )
+        if not_modified is not None:
+            return not_modified
+
+        # Age is relative to the time of the request, not of the cache fill.
+        # Cached responses are shared, so build a copy instead of mutating.
+        forecast_at = datetime.fromisoformat(forecast["forecast_at"])
+        age_seconds = int((datetime.now(forecast_at.tzinfo) - forecast_at).total_seconds())
+        return {**cached_response, "forecast": {**forecast, "age_seconds": age_seconds}}
+
     try:
-        result = get_cached_forecast(city, language)
+        # Run the blocking database call off the event loop
+        result = await asyncio.to_thread(get_cached_forecast, city_lc, language, include_audio)
 
         if result.get("status") == "error":
             raise DatabaseConnectionError(result.get("message", "Database error"))
@@ -127,36 +274,58 @@ async def get_latest_forecast(
         if not result.get("cached"):
             raise ForecastNotFoundError(city)
 
-        return {
+        expires_at = result["expires_at"]
+        get = result.get
+        metadata = {
+            "encoding": result["encoding"],
+            "language": get("language"),
+            "locale": get("locale"),
+            "sizes": result["sizes"]
+        }
+        forecast = {
+            "text": result["forecast_text"],
+            "picture_url": get("picture_url"),
+            "forecast_at": result["forecast_at"],
+            "expires_at": expires_at,
+            "age_seconds": result["age_seconds"],
+            "metadata": metadata
+        }
+        if include_audio:
+            forecast["audio_base64"] = result["audio_data"]
+
+        payload = {
             "status": "success",
-            "city": city.lower(),
-            "forecast": {
-                "text": result["forecast_text"],
-                "audio_base64": result["audio_data"],
-                "picture_url": result.get("picture_url"),
-                "forecast_at": result["forecast_at"],
-                "expires_at": result["expires_at"],
-                "age_seconds": result["age_seconds"],
-                "metadata": {
-                    "encoding": result["encoding"],
-                    "language": result.get("language"),
-                    "locale": result.get("locale"),
-                    "sizes": result["sizes"]
-                }
-            }
+            "city": city_lc,
+            "forecast": forecast
         }
+
+        # Never cache past the forecast expiration. Fill the cache before any
+        # 304 so later conditional requests are answered without the database.
+        await set_cached_response(cache_key, payload, cache_expire_seconds(expires_at))
+
+        not_modified = _conditional_response(request, response, result["forecast_at"], expires_at)
+        if not_modified is not None:
+            return not_modified
+
+        return payload
     except ForecastNotFoundError as e:
-        # Trigger async forecast preparation when forecast not found (non-blocking)
+        # Trigger forecast preparation after the response is sent (non-blocking)
         logger.warning(f"triggering forecast preparation for {city}: {str(e)}")
-        trigger_forecast_preparation(city, language)
+        background_tasks.add_task(trigger_forecast_preparation, city, language)
 
-        # Still raise the original error
-        raise
+        # Background tasks only run with a returned response, so return the
+        # 404 directly instead of raising
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail},
+            background=background_tasks
+        )
     except DatabaseConnectionError:
         raise
     except Exception as e:
-        # Log unexpected errors but don't mask their type
-        logger.error(f"Unexpected error in get_latest_forecast: {str(e)}", exc_info=True)
+        # Log unexpected errors but don't mask their type; the traceback is
+        # logged once by the server when the exception propagates
+        logger.error(f"Unexpected error in get_latest_forecast: {str(e)}")
         raise
 
 
@@ -176,21 +345,23 @@ async def get_forecast_history(
     include_expired: bool = Query(False, description="Include expired forecasts")
 ):
     """Get forecast history for a city"""
+    city_lc = city.lower()
     try:
-        result = list_forecasts(city=city, limit=limit)
+        result = await asyncio.to_thread(
+            list_forecasts,
+            city=city_lc,
+            limit=limit,
+            include_expired=include_expired
+        )
 
         if result.get("status") == "error":
             raise DatabaseConnectionError(result.get("message", "Database error"))
 
         forecasts = result.get("forecasts", [])
 
-        # Filter expired if requested
-        if not include_expired:
-            forecasts = [f for f in forecasts if not f.get("expired", False)]
-
         return {
             "status": "success",
-            "city": city.lower(),
+            "city": city_lc,
             "count": len(forecasts),
             "forecasts": forecasts
         }
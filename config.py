@@ -3,7 +3,7 @@ Configuration management for FastAPI server.
 Loads settings from environment variables with validation.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -30,6 +30,20 @@ class Settings(BaseSettings):
     CLOUD_SQL_USER: str = "postgres"
     CLOUD_SQL_PASSWORD: str
 
+    # Database Connection Pool Configuration
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+
+    # Response Cache Configuration (in-memory cache when unset)
+    REDIS_URL: Optional[str] = None
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # Forecast Trigger Configuration ("none" disables triggering on 404)
+    FORECAST_TRIGGER_BACKEND: Literal["http_agent", "none"] = "http_agent"
+    MAX_CONCURRENT_AGENT_CALLS: int = 8
+
     # Weather Agent URL Configuration
     WEATHER_AGENT_URL: str = "http://127.0.0.1:8200"
 
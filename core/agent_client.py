@@ -0,0 +1,54 @@
+"""
+Weather Agent HTTP client management.
+
+Provides a shared, connection-pooled async HTTP client so calls to the
+Weather Agent reuse TCP/TLS connections across requests. HTTP/2 is
+negotiated over TLS, so both agent calls for a forecast multiplex over a
+single connection.
+
+httpx is imported on first use, since the client is only needed when a
+forecast is missing and keeps it out of worker cold start.
+"""
+
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+# Global client instance (initialized on first use)
+_agent_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_agent_client() -> "httpx.AsyncClient":
+    """
+    Get or create the global Weather Agent HTTP client.
+
+    Returns:
+        httpx.AsyncClient instance
+    """
+    global _agent_client
+    if _agent_client is None:
+        import httpx
+
+        _agent_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300
+            ),
+            http2=True
+        )
+    return _agent_client
+
+
+async def close_agent_client():
+    """
+    Close the global Weather Agent client and release pooled connections.
+
+    Should be called when shutting down the application.
+    """
+    global _agent_client
+    if _agent_client:
+        await _agent_client.aclose()
+        _agent_client = None
@@ -0,0 +1,187 @@
+"""
+Response cache for forecast endpoints.
+
+Uses fastapi-cache2 with a Redis backend when REDIS_URL is configured,
+falling back to an in-process memory backend otherwise. With Redis, a
+short-lived in-process L1 cache of built responses sits in front of it.
+
+Forecasts are written by the Weather Agent in its own process, so nothing
+in this service sees a write. Entries are bounded by the forecast's
+expiration instead; a writer sharing the Redis cache should clear the
+city's namespace (see invalidate_forecast_cache) after each upload.
+"""
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import quote
+
+from cachetools import TLRUCache
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "forecast-cache"
+
+# Upper bound on how long a response is cached, regardless of forecast TTL
+MAX_CACHE_SECONDS = 300
+
+# Global Redis client (initialized in init_cache)
+_redis = None
+
+# In-process (L1) cache in front of Redis, keyed on the response cache key.
+# Values are (response, expire); entries live min(L1_CACHE_TTL_SECONDS, expire).
+# Only used with the Redis backend (the in-memory backend is already in-process)
+# and only accessed from the event loop thread.
+L1_CACHE_MAXSIZE = 1024
+L1_CACHE_TTL_SECONDS = 30
+
+
+def _l1_ttu(key: str, value: Tuple[Dict[str, Any], int], now: float) -> float:
+    """Expiration time of an L1 entry"""
+    return now + min(L1_CACHE_TTL_SECONDS, value[1])
+
+
+_l1: TLRUCache = TLRUCache(maxsize=L1_CACHE_MAXSIZE, ttu=_l1_ttu)
+
+
+def init_cache():
+    """
+    Initialize the global response cache backend.
+
+    Should be called when starting the application.
+    """
+    global _redis
+
+    if settings.REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+
+        # Short timeouts so a Redis outage falls through to the database
+        _redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+        )
+        FastAPICache.init(RedisBackend(_redis), prefix=CACHE_PREFIX)
+        logger.info("Response cache using Redis backend")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
+        logger.info("Response cache using in-memory backend")
+
+
+async def close_cache():
+    """
+    Close the Redis client (if any) and reset the response cache.
+
+    Should be called when shutting down the application.
+    """
+    global _redis
+    if _redis:
+        await _redis.aclose()
+        _redis = None
+    _l1.clear()
+    FastAPICache.reset()
+
+
+def forecast_namespace(city: str) -> str:
+    """
+    Cache namespace holding all cached responses for a city.
+
+    The city is percent-encoded so glob characters ('*', '?', '[') and
+    quotes can't widen or break the Redis backend's KEYS '<namespace>:*'
+    pattern. The trailing ':' keeps clearing 'chi' from also matching
+    'chicago' on backends that clear by plain prefix match.
+    """
+    return f"forecast:{quote(city.lower(), safe='')}:"
+
+
+def forecast_cache_key(city: str, language: Optional[str] = None, include_audio: bool = True) -> str:
+    """Cache key for the latest forecast of a city/language pair, with or without audio"""
+    variant = "audio" if include_audio else "text"
+    # Namespace and key parts are joined with ':' as FastAPICache.clear expects
+    return f"{CACHE_PREFIX}:{forecast_namespace(city)}:{language or 'default'}:{variant}"
+
+
+def cache_expire_seconds(expires_at: str) -> int:
+    """
+    Compute how long a forecast response may be cached.
+
+    Args:
+        expires_at: Forecast expiration timestamp (ISO 8601)
+
+    Returns:
+        Seconds until min(forecast expiration, MAX_CACHE_SECONDS), or 0 if expired
+    """
+    expires = datetime.fromisoformat(expires_at)
+    remaining = (expires - datetime.now(expires.tzinfo)).total_seconds()
+    return max(0, min(int(remaining), MAX_CACHE_SECONDS))
+
+
+async def get_cached_response(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached response, checking the L1 cache before the backend.
+
+    The returned dictionary may be shared with the cache and must not be mutated.
+
+    Returns:
+        Cached response dictionary, or None on miss or cache failure
+    """
+    if _redis is not None:
+        entry = _l1.get(key)
+        if entry is not None:
+            return entry[0]
+
+    try:
+        ttl, value = await FastAPICache.get_backend().get_with_ttl(key)
+        if value is None:
+            return None
+        response = FastAPICache.get_coder().decode(value)
+        if _redis is not None and ttl > 0:
+            _l1[key] = (response, ttl)
+        return response
+    except Exception as e:
+        logger.warning(f"Response cache lookup failed for {key}: {str(e)}")
+        return None
+
+
+async def set_cached_response(key: str, response: Dict[str, Any], expire: int):
+    """
+    Store a response in the cache for `expire` seconds.
+
+    Cache failures are logged and never fail the request.
+    """
+    if expire <= 0:
+        return
+
+    if _redis is not None:
+        _l1[key] = (response, expire)
+
+    try:
+        value = FastAPICache.get_coder().encode(response)
+        await FastAPICache.get_backend().set(key, value, expire=expire)
+    except Exception as e:
+        logger.warning(f"Response cache store failed for {key}: {str(e)}")
+
+
+async def invalidate_forecast_cache(city: str) -> int:
+    """
+    Drop all cached responses for a city, from the L1 cache and the backend.
+
+    For writers that share the response cache; this service never writes
+    forecasts. Other processes' L1 entries expire within L1_CACHE_TTL_SECONDS.
+
+    Returns:
+        Number of backend cache entries removed
+    """
+    key_prefix = f"{CACHE_PREFIX}:{forecast_namespace(city)}"
+    for key in [key for key in _l1.keys() if key.startswith(key_prefix)]:
+        _l1.pop(key, None)
+
+    try:
+        return await FastAPICache.clear(namespace=forecast_namespace(city))
+    except Exception as e:
+        logger.warning(f"Response cache invalidation failed for {city}: {str(e)}")
+        return 0
@@ -3,9 +3,12 @@ Cloud SQL connection management.
 
 Provides secure connections to Google Cloud SQL PostgreSQL using
 the Cloud SQL Python Connector with IAM authentication support.
+Connections are pooled with a SQLAlchemy QueuePool so requests reuse
+established connections instead of paying the Cloud SQL handshake.
 """
 
 from typing import Optional
+import sqlalchemy
 from google.cloud.sql.connector import Connector
 
 from config import settings
@@ -16,8 +19,15 @@ if settings.GOOGLE_CLOUD_PROJECT and settings.GOOGLE_CLOUD_LOCATION and settings
 else:
     INSTANCE_CONNECTION_NAME = None
 
-# Global connector instance (initialized on first use)
+# Global connector and engine instances (initialized on first use)
 _connector: Optional[Connector] = None
+_engine: Optional[sqlalchemy.engine.Engine] = None
+
+# Server version and schema check results, cached after the first check
+# since they do not change at runtime
+_schema_checked: bool = False
+_server_version: Optional[str] = None
+_forecasts_table_exists: Optional[bool] = None
 
 
 def get_connector() -> Connector:
@@ -33,14 +43,46 @@ def get_connector() -> Connector:
     return _connector
 
 
+def _create_connection():
+    """Open a new pg8000 connection through the Cloud SQL connector"""
+    return get_connector().connect(
+        INSTANCE_CONNECTION_NAME,
+        "pg8000",
+        user=settings.CLOUD_SQL_USER,
+        password=settings.CLOUD_SQL_PASSWORD,
+        db=settings.CLOUD_SQL_DB
+    )
+
+
+def get_engine() -> sqlalchemy.engine.Engine:
+    """
+    Get or create the global pooled SQLAlchemy engine.
+
+    Returns:
+        Engine whose pool hands out Cloud SQL pg8000 connections
+    """
+    global _engine
+    if _engine is None:
+        _engine = sqlalchemy.create_engine(
+            "postgresql+pg8000://",
+            creator=_create_connection,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE
+        )
+    return _engine
+
+
 def get_connection():
     """
-    Get a connection to Cloud SQL PostgreSQL using pg8000.
+    Get a pooled connection to Cloud SQL PostgreSQL using pg8000.
 
-    Returns a raw pg8000 DB-API connection suitable for reading/writing binary data (BYTEA columns).
+    Returns a raw DB-API connection suitable for reading/writing binary data (BYTEA columns).
+    Calling close() on it returns the connection to the pool.
 
     Returns:
-        pg8000 connection object
+        Pooled pg8000 connection object
 
     Raises:
         ValueError: If required environment variables are not set
@@ -66,17 +108,8 @@ def get_connection():
             "Please set the database password."
         )
 
-    connector = get_connector()
-
     try:
-        conn = connector.connect(
-            INSTANCE_CONNECTION_NAME,
-            "pg8000",
-            user=settings.CLOUD_SQL_USER,
-            password=settings.CLOUD_SQL_PASSWORD,
-            db=settings.CLOUD_SQL_DB
-        )
-        return conn
+        return get_engine().raw_connection()
     except Exception as e:
         raise Exception(
             f"Failed to connect to Cloud SQL instance {INSTANCE_CONNECTION_NAME}: {e}"
@@ -85,51 +118,66 @@ def get_connection():
 
 def close_connector():
     """
-    Close the global connector and cleanup resources.
+    Dispose the connection pool, close the global connector and cleanup resources.
 
     Should be called when shutting down the application.
     """
-    global _connector
+    global _connector, _engine
+    if _engine:
+        _engine.dispose()
+        _engine = None
     if _connector:
         _connector.close()
         _connector = None
 
 
-def test_connection() -> dict:
+def test_connection(deep: bool = False) -> dict:
     """
     Test the database connection and return status.
 
+    The server version and forecasts table check run on the first call and
+    are cached. Later calls only check out a pooled connection: the pool's
+    pre-ping (or opening a fresh connection) is the liveness check, so no
+    extra query is sent.
+
+    Args:
+        deep: Re-run the server version and forecasts table check
+
     Returns:
         Dictionary with connection status and details
     """
+    global _schema_checked, _server_version, _forecasts_table_exists
+    conn = None
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-
-        # Test query
-        cursor.execute("SELECT version()")
-        result = cursor.fetchone()
-        version = result[0] if result else "Unknown"
-
-        # Check if forecasts table exists
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_name = 'forecasts'
-            )
-        """)
-        table_exists = cursor.fetchone()[0]
 
-        cursor.close()
-        conn.close()
+        if deep or not _schema_checked:
+            cursor = conn.cursor()
+            try:
+                # Test query
+                cursor.execute("SELECT version()")
+                result = cursor.fetchone()
+                _server_version = result[0] if result else "Unknown"
+
+                # Check if forecasts table exists
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables
+                        WHERE table_name = 'forecasts'
+                    )
+                """)
+                _forecasts_table_exists = cursor.fetchone()[0]
+                _schema_checked = True
+            finally:
+                cursor.close()
 
         return {
             "status": "success",
             "connected": True,
             "instance": INSTANCE_CONNECTION_NAME,
             "database": settings.CLOUD_SQL_DB,
-            "version": version,
-            "forecasts_table_exists": table_exists
+            "version": _server_version,
+            "forecasts_table_exists": _forecasts_table_exists
         }
     except Exception as e:
         return {
@@ -138,3 +186,7 @@ def test_connection() -> dict:
             "error": str(e),
             "instance": INSTANCE_CONNECTION_NAME or "Not configured"
         }
+    finally:
+        # Return the connection to the pool even if a query failed
+        if conn is not None:
+            conn.close()
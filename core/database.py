@@ -15,9 +15,9 @@ from .forecast_operations import (
 )
 
 
-def test_db_connection() -> dict:
-    """Test database connection on startup"""
-    return test_connection()
+def test_db_connection(deep: bool = False) -> dict:
+    """Test database connection (deep=True re-checks server version and schema)"""
+    return test_connection(deep=deep)
 
 
 def cleanup_db_connection():
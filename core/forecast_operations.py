@@ -140,7 +140,8 @@ def upload_forecast(
 
 def get_cached_forecast(
     city: str,
-    language: Optional[str] = None
+    language: Optional[str] = None,
+    include_audio: bool = True
 ) -> Dict[str, Any]:
     """
     Retrieve cached forecast from Cloud SQL if available.
@@ -148,6 +149,7 @@ def get_cached_forecast(
     Args:
         city: City name to query
         language: Optional language filter (e.g., 'en', 'es', 'ja')
+        include_audio: Whether to read the audio BYTEA column (audio_data is omitted if False)
 
     Returns:
         Dictionary with cached forecast or cached=False if not found
@@ -156,10 +158,12 @@ def get_cached_forecast(
     cursor = conn.cursor()
 
     try:
-        # Build query with optional language filter
-        query = """
+        # Build query with optional language filter. Text-only reads select
+        # NULL in place of the audio column to skip transferring the blob.
+        audio_column = "audio_file" if include_audio else "NULL"
+        query = f"""
             SELECT
-                id, forecast_text, audio_file, forecast_at,
+                id, forecast_text, {audio_column}, forecast_at,
                 expires_at, text_size_bytes, audio_size_bytes,
                 text_encoding, text_language, text_locale,
                 created_at, metadata, picture_url
@@ -201,10 +205,9 @@ def get_cached_forecast(
             # Calculate age
             age_seconds = (datetime.now(result[3].tzinfo) - result[3]).total_seconds()  # forecast_at
 
-            return {
+            forecast = {
                 "cached": True,
                 "forecast_text": forecast_text,
-                "audio_data": base64.b64encode(bytes(result[2])).decode('utf-8'),  # audio_file
                 "picture_url": result[12],  # picture_url
                 "forecast_at": result[3].isoformat(),  # forecast_at
                 "expires_at": result[4].isoformat(),  # expires_at
@@ -219,6 +222,11 @@ def get_cached_forecast(
                 "metadata": result[11]  # metadata
             }
 
+            if include_audio:
+                forecast["audio_data"] = base64.b64encode(bytes(result[2])).decode('utf-8')  # audio_file
+
+            return forecast
+
         return {"cached": False}
 
     except Exception as e:
@@ -339,7 +347,8 @@ def get_storage_stats() -> Dict[str, Any]:
 
 def list_forecasts(
     city: Optional[str] = None,
-    limit: int = 10
+    limit: int = 10,
+    include_expired: bool = True
 ) -> Dict[str, Any]:
     """
     List forecast history for a city.
@@ -347,6 +356,7 @@ def list_forecasts(
     Args:
         city: City name (optional, lists all if omitted)
         limit: Maximum number of results (default: 10)
+        include_expired: Include expired forecasts (default: True)
 
     Returns:
         Dictionary with list of forecasts
@@ -363,12 +373,20 @@ def list_forecasts(
                 created_at
             FROM forecasts
         """
+        conditions = []
         params = []
 
         if city:
-            query += " WHERE city = %s"
+            conditions.append("city = %s")
             params.append(city.lower())
 
+        # Filter in SQL so LIMIT applies to the rows actually returned
+        if not include_expired:
+            conditions.append("expires_at > NOW()")
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
         query += " ORDER BY forecast_at DESC LIMIT %s"
         params.append(limit)
 
@@ -1,7 +1,10 @@
 """
 FastAPI application entry point for Weather Forecast API.
 """
+import asyncio
 import logging
+import logging.config
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
@@ -10,12 +13,29 @@ from fastapi.middleware.cors import CORSMiddleware
 from config import settings
 from api.routes import weather, stats, health
 from core.database import test_db_connection, cleanup_db_connection
+from core.cache import init_cache, close_cache
+from core.agent_client import close_agent_client
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging once for the whole application
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        }
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "default"
+        }
+    },
+    "root": {
+        "level": settings.LOG_LEVEL,
+        "handlers": ["console"]
+    }
+})
 logger = logging.getLogger(__name__)
 
 
@@ -24,17 +44,28 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("Starting Weather Forecast API")
+
+    # Blocking database calls run in the default executor; size it to the
+    # connection pool so worker threads never wait for a connection
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    )
+
     conn_status = test_db_connection()
     if conn_status["connected"]:
         logger.info(f"Database connected: {conn_status['instance']}")
     else:
         logger.error(f"Database connection failed: {conn_status.get('error')}")
 
+    init_cache()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Weather Forecast API")
     cleanup_db_connection()
+    await close_agent_client()
+    await close_cache()
 
 
 # Initialize FastAPI app
@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the Weather Forecast API unit tests.
+
+The database is never contacted: tests patch the functions the routes
+call, and the response cache always uses the in-memory backend.
+"""
+import os
+
+# Required settings must exist before config is imported
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+os.environ.setdefault("CLOUD_SQL_PASSWORD", "test-password")
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+import main
+from api.routes import weather
+from config import settings
+
+
+@pytest.fixture
+def client():
+    """Test client running the app lifespan without a database or Redis"""
+    with mock.patch.object(settings, "REDIS_URL", None), \
+            mock.patch.object(main, "test_db_connection", return_value={"connected": True, "instance": "test"}), \
+            mock.patch.object(main, "cleanup_db_connection"):
+        with TestClient(main.app) as test_client:
+            yield test_client
+
+    # The in-memory backend store is shared by every instance
+    InMemoryBackend._store.clear()
+    weather._inflight.clear()
+
+
+@pytest.fixture
+def agent_backend():
+    """Replace the Weather Agent trigger backend with an AsyncMock"""
+    backend = mock.AsyncMock()
+    with mock.patch.object(settings, "FORECAST_TRIGGER_BACKEND", "http_agent"), \
+            mock.patch.dict(weather._TRIGGER_BACKENDS, {"http_agent": backend}):
+        yield backend
+    weather._inflight.clear()
+
+
+def make_forecast_result(age_seconds: int = 0, include_audio: bool = True) -> Dict[str, Any]:
+    """
+    Build a get_cached_forecast() result for a forecast made `age_seconds` ago.
+
+    The returned age_seconds is always 0, so tests can tell a value copied
+    from the database result from one recomputed at request time.
+    """
+    forecast_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    result = {
+        "cached": True,
+        "forecast_text": "Sunny, high of 75F",
+        "picture_url": None,
+        "forecast_at": forecast_at.isoformat(),
+        "expires_at": (forecast_at + timedelta(minutes=30)).isoformat(),
+        "age_seconds": 0,
+        "encoding": "utf-8",
+        "language": "en",
+        "locale": "en-US",
+        "sizes": {"text": 18, "audio": 4},
+        "metadata": {}
+    }
+    if include_audio:
+        result["audio_data"] = "UklGRg=="
+    return result
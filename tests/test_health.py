@@ -0,0 +1,94 @@
+"""
+Unit tests for the health check endpoints and the database connection check.
+"""
+from unittest import mock
+
+import pytest
+
+from api.routes import health
+from core import connection
+
+
+@pytest.fixture
+def schema_unchecked():
+    """Reset the cached schema check so the next check runs the queries"""
+    with mock.patch.object(connection, "_schema_checked", False), \
+            mock.patch.object(connection, "_server_version", None), \
+            mock.patch.object(connection, "_forecasts_table_exists", None):
+        yield
+
+
+class TestHealthEndpoints:
+    """GET /health and /health/deep"""
+
+    def test_health_uses_cheap_check(self, client):
+        status = {"connected": True, "instance": "test", "version": "PostgreSQL 15"}
+        with mock.patch.object(health, "test_db_connection", return_value=status) as check:
+            response = client.get("/health/")
+
+        check.assert_called_once_with()
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+        assert response.json()["database"]["version"] == "PostgreSQL 15"
+
+    def test_deep_health_rechecks_schema(self, client):
+        with mock.patch.object(health, "test_db_connection", return_value={"connected": True}) as check:
+            client.get("/health/deep")
+
+        check.assert_called_once_with(deep=True)
+
+    def test_unhealthy_when_database_is_down(self, client):
+        status = {"connected": False, "error": "connection refused"}
+        with mock.patch.object(health, "test_db_connection", return_value=status):
+            response = client.get("/health/")
+
+        assert response.json()["status"] == "unhealthy"
+        assert response.json()["database"]["error"] == "connection refused"
+
+
+class TestConnectionCheck:
+    """core.connection.test_connection()"""
+
+    def test_first_check_runs_schema_queries(self, schema_unchecked):
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchone.side_effect = [("PostgreSQL 15",), (True,)]
+        with mock.patch.object(connection, "get_connection", return_value=conn):
+            result = connection.test_connection()
+
+        assert result["connected"] is True
+        assert result["version"] == "PostgreSQL 15"
+        assert result["forecasts_table_exists"] is True
+        cursor.close.assert_called_once()
+        conn.close.assert_called_once()
+
+    def test_later_checks_open_no_cursor(self, schema_unchecked):
+        conn = mock.MagicMock()
+        conn.cursor.return_value.fetchone.side_effect = [("PostgreSQL 15",), (True,)]
+        with mock.patch.object(connection, "get_connection", return_value=conn):
+            connection.test_connection()
+            conn.reset_mock()
+            result = connection.test_connection()
+
+        assert result["connected"] is True
+        assert result["version"] == "PostgreSQL 15"
+        conn.cursor.assert_not_called()
+        conn.close.assert_called_once()
+
+    def test_connection_is_returned_when_query_fails(self, schema_unchecked):
+        conn = mock.MagicMock()
+        conn.cursor.return_value.execute.side_effect = RuntimeError("server closed the connection")
+        with mock.patch.object(connection, "get_connection", return_value=conn):
+            result = connection.test_connection(deep=True)
+
+        assert result["connected"] is False
+        assert "server closed the connection" in result["error"]
+        conn.cursor.return_value.close.assert_called_once()
+        conn.close.assert_called_once()
+
+    def test_connection_failure_is_reported(self, schema_unchecked):
+        with mock.patch.object(connection, "get_connection", side_effect=Exception("Failed to connect")):
+            result = connection.test_connection()
+
+        assert result["status"] == "error"
+        assert result["connected"] is False
@@ -0,0 +1,180 @@
+"""
+Unit tests for the weather forecast endpoints.
+"""
+import asyncio
+from unittest import mock
+
+from api.routes import weather
+from core import forecast_operations
+from tests.conftest import make_forecast_result
+
+
+class TestLatestForecast:
+    """GET /weather/{city}"""
+
+    def test_cache_hit_skips_database_and_recomputes_age(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result(age_seconds=120)) as db:
+            first = client.get("/weather/Chicago")
+            second = client.get("/weather/chicago")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        db.assert_called_once_with("chicago", None, True)
+        assert first.json()["forecast"]["age_seconds"] == 0
+        assert second.json()["forecast"]["age_seconds"] >= 120
+        assert second.json()["forecast"]["text"] == first.json()["forecast"]["text"]
+
+    def test_not_found_is_not_cached_and_triggers_once(self, client):
+        trigger = mock.AsyncMock()
+        with mock.patch.object(weather, "get_cached_forecast", return_value={"cached": False}) as db, \
+                mock.patch.object(weather, "trigger_forecast_preparation", trigger):
+            response = client.get("/weather/atlantis?language=en")
+
+            assert response.status_code == 404
+            trigger.assert_awaited_once_with("atlantis", "en")
+
+            assert client.get("/weather/atlantis?language=en").status_code == 404
+
+        assert db.call_count == 2
+        assert trigger.await_count == 2
+
+    def test_include_audio_false_omits_audio(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result(include_audio=False)) as db:
+            response = client.get("/weather/chicago?include_audio=false")
+
+        assert response.status_code == 200
+        db.assert_called_once_with("chicago", None, False)
+        assert "audio_base64" not in response.json()["forecast"]
+
+    def test_audio_and_text_responses_are_cached_separately(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result(include_audio=False)):
+            client.get("/weather/chicago?include_audio=false")
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()) as db:
+            response = client.get("/weather/chicago")
+
+        db.assert_called_once_with("chicago", None, True)
+        assert response.json()["forecast"]["audio_base64"] == "UklGRg=="
+
+
+class TestConditionalRequests:
+    """ETag / If-None-Match on GET /weather/{city}"""
+
+    def test_response_carries_validators(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()):
+            response = client.get("/weather/chicago")
+
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+    def test_matching_etag_returns_not_modified(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()) as db:
+            etag = client.get("/weather/chicago").headers["etag"]
+            response = client.get("/weather/chicago", headers={"If-None-Match": etag})
+
+        db.assert_called_once()
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.content == b""
+
+    def test_strong_form_of_etag_matches(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()):
+            etag = client.get("/weather/chicago").headers["etag"]
+            strong = etag.removeprefix("W/")
+            response = client.get("/weather/chicago", headers={"If-None-Match": f'"0", {strong}'})
+
+        assert response.status_code == 304
+
+    def test_wildcard_matches_existing_forecast(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()) as db:
+            response = client.get("/weather/chicago", headers={"If-None-Match": "*"})
+
+        db.assert_called_once()
+        assert response.status_code == 304
+
+    def test_stale_etag_returns_forecast(self, client):
+        with mock.patch.object(weather, "get_cached_forecast", return_value=make_forecast_result()):
+            response = client.get("/weather/chicago", headers={"If-None-Match": 'W/"0"'})
+
+        assert response.status_code == 200
+        assert response.json()["forecast"]["text"] == "Sunny, high of 75F"
+
+
+class TestForecastHistory:
+    """GET /weather/{city}/history and list_forecasts()"""
+
+    def test_route_excludes_expired_by_default(self, client):
+        with mock.patch.object(weather, "list_forecasts", return_value={"status": "success", "forecasts": []}) as db:
+            response = client.get("/weather/Chicago/history?limit=5")
+
+        assert response.status_code == 200
+        db.assert_called_once_with(city="chicago", limit=5, include_expired=False)
+
+    def test_expired_forecasts_are_filtered_in_sql(self):
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = []
+        with mock.patch.object(forecast_operations, "get_connection", return_value=conn):
+            forecast_operations.list_forecasts("chicago", limit=5, include_expired=False)
+
+        query, params = cursor.execute.call_args.args
+        assert "expires_at > NOW()" in query
+        assert query.index("expires_at > NOW()") < query.index("LIMIT")
+        assert params == ["chicago", 5]
+
+    def test_include_expired_has_no_expiry_filter(self):
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = []
+        with mock.patch.object(forecast_operations, "get_connection", return_value=conn):
+            forecast_operations.list_forecasts("chicago", include_expired=True)
+
+        query, _ = cursor.execute.call_args.args
+        assert "expires_at" not in query.split("FROM forecasts")[1]
+
+
+class TestForecastTrigger:
+    """trigger_forecast_preparation() coalescing and concurrency cap"""
+
+    def test_concurrent_triggers_for_a_city_call_agent_once(self, agent_backend):
+        async def slow_call(city, language):
+            await asyncio.sleep(0.05)
+        agent_backend.side_effect = slow_call
+
+        async def run():
+            await asyncio.gather(
+                weather.trigger_forecast_preparation("Chicago", "en"),
+                weather.trigger_forecast_preparation("chicago", "en"),
+                weather.trigger_forecast_preparation("chicago", "en")
+            )
+
+        asyncio.run(run())
+
+        agent_backend.assert_awaited_once_with("Chicago", "en")
+        assert weather._inflight == {}
+
+    def test_trigger_is_skipped_when_no_slot_frees_up(self, agent_backend, caplog):
+        release = None
+
+        async def blocked_call(city, language):
+            await release.wait()
+        agent_backend.side_effect = blocked_call
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            first = asyncio.create_task(weather.trigger_forecast_preparation("chicago"))
+            await asyncio.sleep(0)
+            await weather.trigger_forecast_preparation("tokyo")
+            release.set()
+            await first
+
+        # A second event loop (e.g. a new TestClient) gets its own semaphore
+        with mock.patch.object(weather.settings, "MAX_CONCURRENT_AGENT_CALLS", 1):
+            asyncio.run(run())
+            asyncio.run(run())
+
+        assert agent_backend.await_args_list == [mock.call("chicago", None)] * 2
+        skipped = [r for r in caplog.records if "Too many forecast preparations" in r.getMessage()]
+        assert len(skipped) == 2
+        assert weather._inflight == {}